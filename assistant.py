@@ -14,9 +14,13 @@ Setup:
 1) Create a folder and place this script inside it.
 2) Download and unzip a VOSK model (small English):
    https://alphacephei.com/vosk/models/vosk-model-small-en-us-0.15.zip
-   Rename the extracted folder to `model` and put it next to this script.
+   Rename the extracted folder to `model` and put it next to this script,
+   or point the VOSK_MODEL_PATH environment variable at it.
+   Small models are much lighter than the large ones and decode several times faster,
+   which matters for realtime use on laptops and Raspberry Pi-class machines.
+   The model must be trained for 16 kHz audio (SAMPLE_RATE); a mismatch is reported at load time.
 3) Install dependencies:
-   pip install vosk sounddevice pyttsx3 Pillow pyautogui
+   pip install vosk sounddevice numpy pyttsx3 Pillow pyautogui
 
 Run:
    python cute_voice_assistant_gui.py
@@ -24,80 +28,371 @@ Run:
 Notes:
 - Designed for Windows; should also work on macOS/Linux with small changes (winsound removed).
 - If sounddevice installation fails, try using wheels or using the earlier file-based fallback.
+- If your microphone does not support 16 kHz, set MIC_SAMPLE_RATE to an integer multiple of it
+  (e.g. 48000; 44100 is rejected). Audio is then downsampled before reaching VOSK; with numba installed
+  that step is JIT-compiled.
+- Optional speedups: `pip install orjson` for faster parsing of VOSK results.
+- OMP/OpenBLAS/MKL are limited to one thread by default: the small model's matrix products are too
+  small to benefit from more, and extra threads just fight over cache. Export e.g.
+  OMP_NUM_THREADS=4 before starting to override this if a larger model decodes faster with it.
 """
 
+import os
+
+# Must run before numpy/vosk load their BLAS libraries, which read these once at startup.
+for _var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+    os.environ.setdefault(_var, '1')
+
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import threading
 import queue
+import collections
 import time
 import json
+import re
 import webbrowser
-import datetime
-import os
 import pyautogui
 
 # STT/TTS imports
+import numpy as np
 import sounddevice as sd
 from vosk import Model, KaldiRecognizer
 import pyttsx3
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    json_loads = json.loads
+
 # ---------- Configuration ----------
-MODEL_PATH = "model"  # folder name of vosk model
-SAMPLE_RATE = 16000
+MODEL_PATH = os.environ.get('VOSK_MODEL_PATH', 'model')  # folder of the vosk model
+SAMPLE_RATE = 16000  # rate the VOSK model expects
+MIC_SAMPLE_RATE = SAMPLE_RATE  # capture rate; must be an integer multiple of SAMPLE_RATE
+BLOCK_SIZE = MIC_SAMPLE_RATE // 10  # samples per audio callback (100 ms); raise this if you see input overflows (e.g. on a Raspberry Pi)
+PARTIAL_INTERVAL = 0.2  # seconds between live "partial" transcript previews
+MAX_TRANSCRIPT_LINES = 500  # older transcript lines are dropped to keep the GUI responsive
 
 # ---------- Voice (TTS) ----------
 engine = pyttsx3.init()
 engine.setProperty('rate', 160)
 engine.setProperty('volume', 1.0)
 
+# pyttsx3 engines are not reentrant, so a single thread owns `engine` and speaks queued text in order.
+tts_q = queue.Queue()
+tts_stop = threading.Event()  # set by stop_tts; checked by the driver callbacks on the TTS thread
+
+
+def _on_tts_event(*args):
+    # Driver callbacks run inside runAndWait on the TTS thread, so stopping here interrupts speech
+    # in progress without touching `engine` from another thread.
+    if tts_stop.is_set():
+        engine.stop()
+
+
+def _tts_worker():
+    engine.connect('started-utterance', _on_tts_event)
+    engine.connect('started-word', _on_tts_event)
+    stopping = False
+    while not stopping:
+        text = tts_q.get()
+        if text is None:  # sentinel from stop_tts
+            break
+        engine.say(text)
+        # Queue up anything else that arrived meanwhile so one runAndWait covers the batch.
+        while True:
+            try:
+                text = tts_q.get_nowait()
+            except queue.Empty:
+                break
+            if text is None:
+                stopping = True
+                break
+            engine.say(text)
+        if not stopping:
+            engine.runAndWait()
+    try:
+        engine.stop()
+    except Exception as e:
+        print('TTS stop error:', e)
+
+
+tts_thread = threading.Thread(target=_tts_worker, daemon=True)
+tts_thread.start()
+
+
 def speak(text: str):
     """Speak text asynchronously to avoid blocking the GUI."""
-    def _s():
-        engine.say(text)
-        engine.runAndWait()
-    threading.Thread(target=_s, daemon=True).start()
+    tts_q.put(text)
+
+
+def stop_tts():
+    """Interrupt current speech, drop unspoken text and have the TTS thread stop the engine it owns."""
+    tts_stop.set()
+    while True:
+        try:
+            tts_q.get_nowait()
+        except queue.Empty:
+            break
+    tts_q.put(None)
 
 # ---------- Vosk STT (background thread) ----------
-audio_q = queue.Queue()
-text_q = queue.Queue()
+# Audio travels from the PortAudio callback to stt_worker through a preallocated
+# int16 ring buffer. The callback copies samples into the ring and sets an event;
+# the per-block bytes() copy, the Queue lock and print() are gone from the audio
+# thread. It still creates a small ndarray view over indata and a few slice views.
+RING_SIZE = MIC_SAMPLE_RATE * 4  # 4 seconds of audio
+ring = np.zeros(RING_SIZE, dtype=np.int16)
+ring_head = 0  # total samples written by sd_callback
+ring_tail = 0  # total samples consumed by stt_worker
+ring_status = None  # last non-empty stream status, reported by stt_worker
+audio_evt = threading.Event()
+text_q = collections.deque()  # single producer (stt_worker), single consumer (GUI)
+partial_q = collections.deque(maxlen=1)  # latest in-progress phrase ('' clears it); only the newest one matters
+gui_notify = None  # set by the GUI; called by stt_worker after appending to text_q or partial_q
 listening_flag = threading.Event()
+listen_generation = 0  # bumped by the GUI on every Start so stt_worker can drop the pre-Stop utterance
+shutdown_evt = threading.Event()  # set by the GUI on close; stt_worker exits its loop
+audio_stream = None  # the open microphone stream, owned by stt_worker
+audio_stream_lock = threading.Lock()  # guards handing audio_stream to exactly one closer
 
-try:
-    vosk_model = Model(MODEL_PATH)
-except Exception as e:
-    vosk_model = None
-
+vosk_model = None
 recognizer = None
-if vosk_model:
-    recognizer = KaldiRecognizer(vosk_model, SAMPLE_RATE)
+model_error = None  # message shown by the GUI when load_model fails
+model_ready = threading.Event()  # set once load_model has finished, whether or not it succeeded
+
+
+def prefetch_model_files(path: str):
+    """Ask the OS to start reading the model files into the page cache (POSIX only)."""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                fd = os.open(os.path.join(root, name), os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+
+
+def model_sample_rate(path: str):
+    """Return the sample rate the model was trained on, read from conf/mfcc.conf, or None if unknown."""
+    try:
+        with open(os.path.join(path, 'conf', 'mfcc.conf'), encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('--sample-frequency='):
+                    return int(float(line.split('=', 1)[1]))
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def load_model():
+    """Load the VOSK model and recognizer, then warm up command handlers.
+
+    Runs in a background thread so the GUI opens immediately.
+    """
+    global vosk_model, recognizer, model_error
+    try:
+        if MIC_SAMPLE_RATE % SAMPLE_RATE:
+            # e.g. 44100 // 16000 == 2 would silently hand VOSK 22050 Hz audio
+            raise ValueError(f'MIC_SAMPLE_RATE ({MIC_SAMPLE_RATE} Hz) must be an integer multiple of SAMPLE_RATE ({SAMPLE_RATE} Hz).')
+        prefetch_model_files(MODEL_PATH)
+        vosk_model = Model(MODEL_PATH)
+        mdl = os.path.join(MODEL_PATH, 'am', 'final.mdl')
+        if os.path.exists(mdl):
+            print(f'Loaded VOSK model {MODEL_PATH} ({os.path.getsize(mdl) / 1e6:.1f} MB acoustic model)')
+        rate = model_sample_rate(MODEL_PATH)
+        if rate and rate != SAMPLE_RATE:
+            print(f'Warning: model expects {rate} Hz audio but SAMPLE_RATE is {SAMPLE_RATE} Hz; recognition will be poor.')
+        recognizer = KaldiRecognizer(vosk_model, SAMPLE_RATE)
+        # The GUI shows neither alternatives nor word timings, so skip computing them.
+        recognizer.SetMaxAlternatives(0)
+        recognizer.SetWords(False)
+    except ValueError as e:  # configuration problem, raised above
+        vosk_model = None
+        recognizer = None
+        model_error = str(e)
+        print('Model load error:', e)
+    except Exception as e:
+        vosk_model = None
+        recognizer = None
+        model_error = 'VOSK model not found. Put model folder next to script.'
+        print('Model load error:', e)
+    finally:
+        if recognizer is not None and MIC_SAMPLE_RATE != SAMPLE_RATE:
+            # Compile alongside the model load; listening cannot start before model_ready is set.
+            try:
+                compile_downsampler()
+            except Exception as e:
+                print('Downsampler compile error:', e)
+        model_ready.set()
+    warm_up_commands()
+
+
+def warm_up_commands():
+    """Touch the lazily initialized pieces used by commands so the first command is as fast as later ones."""
+    try:
+        # Import the screenshot command's capture and encode modules without grabbing the screen:
+        # a real capture can trigger a permission prompt (macOS) or a flash/shutter sound (Linux tools).
+        import pyscreeze
+        from PIL import ImageGrab, JpegImagePlugin
+    except Exception as e:
+        print('Warm-up error:', e)
+    try:
+        pyautogui.size()  # initializes pyautogui's platform backend
+        webbrowser.get()  # resolves the default browser
+    except Exception as e:
+        print('Warm-up error:', e)
+    current_time_str()  # loads locale/timezone data
+
+
+def downsample_int16(x, ratio):
+    """Average every `ratio` samples of x into one; trailing samples that do not fill a group are dropped.
+
+    A block average is only a weak anti-alias filter: energy above the new Nyquist frequency is
+    attenuated, not removed, so some aliasing remains. That is tolerable for speech recognition,
+    but this is not a general-purpose resampler.
+    """
+    n = len(x) // ratio
+    return (x[:n * ratio].reshape(n, ratio).sum(axis=1, dtype=np.int64) // ratio).astype(np.int16)
+
+
+def _downsample_int16_loop(x, ratio):
+    """Loop form of downsample_int16 for Numba, which does not support sum(axis=...)."""
+    n = len(x) // ratio
+    out = np.empty(n, dtype=np.int16)
+    for i in range(n):
+        acc = 0
+        for j in range(ratio):
+            acc += int(x[i * ratio + j])
+        out[i] = acc // ratio
+    return out
+
+
+def compile_downsampler():
+    """Replace downsample_int16 with a Numba-compiled version, if numba is installed, and warm it up."""
+    global downsample_int16
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional; keep the vectorized numpy version
+        return
+    downsample_int16 = njit(cache=True)(_downsample_int16_loop)
+    # stt_worker passes a read-only view over bytes, which Numba types separately from a writable array,
+    # so warm up with the same kind of array to keep the JIT cost off the first microphone packet.
+    downsample_int16(np.frombuffer(bytes(2), dtype=np.int16), 1)
 
 
 def sd_callback(indata, frames, time_info, status):
+    global ring_head, ring_status
     if status:
-        print("SoundDevice status:", status)
-    audio_q.put(bytes(indata))
+        ring_status = status
+    if not listening_flag.is_set():
+        return  # drop idle audio at the source so no stale speech is decoded after Start
+    samples = np.frombuffer(indata, dtype=np.int16)
+    n = len(samples)
+    w = ring_head % RING_SIZE
+    first = min(n, RING_SIZE - w)
+    ring[w:w + first] = samples[:first]
+    ring[:n - first] = samples[first:]
+    ring_head += n
+    audio_evt.set()
+
+
+def read_ring() -> bytes:
+    """Block until new audio is available and return it as a single bytes object."""
+    global ring_tail
+    audio_evt.wait()
+    audio_evt.clear()
+    head = ring_head
+    if head - ring_tail > RING_SIZE:
+        # Consumer fell behind by more than the ring holds; drop the oldest audio.
+        ring_tail = head - RING_SIZE
+    a = ring_tail % RING_SIZE
+    n = head - ring_tail
+    ring_tail = head
+    # VOSK's binding passes data to C as `char *` with len(data), so it needs real bytes, not a
+    # memoryview of int16 samples. Build them with exactly one copy, even when the read wraps.
+    if a + n <= RING_SIZE:
+        return ring[a:a + n].tobytes()
+    view = memoryview(ring).cast('B')
+    return b''.join((view[a * ring.itemsize:], view[:(a + n - RING_SIZE) * ring.itemsize]))
+
+
+def close_audio_stream():
+    """Stop and close the microphone stream if it is open; safe to call from any thread, more than once."""
+    global audio_stream
+    with audio_stream_lock:
+        stream, audio_stream = audio_stream, None
+    if stream is not None:
+        stream.stop()
+        stream.close()
 
 
 def stt_worker():
-    """Background worker: consumes audio bytes and pushes recognized text to text_q."""
-    global recognizer
+    """Background worker: consumes audio from the ring buffer and pushes recognized text to text_q
+    and in-progress previews to partial_q."""
+    global recognizer, ring_status, audio_stream
+    last_partial_time = 0.0
+    last_partial = ''
+    generation = listen_generation
     try:
-        with sd.RawInputStream(samplerate=SAMPLE_RATE, blocksize=8000, dtype='int16', channels=1, callback=sd_callback):
-            while True:
-                listening_flag.wait()  # blocks until listening_flag is set
-                try:
-                    data = audio_q.get()
-                except Exception:
-                    continue
-                if recognizer.AcceptWaveform(data):
-                    res = json.loads(recognizer.Result())
-                    txt = res.get('text', '').strip()
-                    if txt:
-                        text_q.put(txt)
-                # else: partial results ignored to avoid spam
+        stream = sd.RawInputStream(samplerate=MIC_SAMPLE_RATE, blocksize=BLOCK_SIZE, dtype='int16', channels=1, latency='low', callback=sd_callback)
+        with audio_stream_lock:
+            audio_stream = stream
+        if stream.samplerate != MIC_SAMPLE_RATE:
+            raise RuntimeError(f'microphone opened at {stream.samplerate} Hz, expected {MIC_SAMPLE_RATE} Hz')
+        stream.start()
+        while not shutdown_evt.is_set():
+            data = read_ring()  # only wakes while listening, since sd_callback drops idle audio
+            if ring_status:
+                print("SoundDevice status:", ring_status)
+                ring_status = None
+            if not data:
+                continue
+            if generation != listen_generation:
+                # Listening was restarted: forget the half-decoded utterance from before Stop.
+                generation = listen_generation
+                recognizer.Reset()
+                last_partial = ''
+            if MIC_SAMPLE_RATE != SAMPLE_RATE:
+                samples = np.frombuffer(data, dtype=np.int16)
+                data = downsample_int16(samples, MIC_SAMPLE_RATE // SAMPLE_RATE).tobytes()
+            if recognizer.AcceptWaveform(data):
+                res = json_loads(recognizer.Result())
+                recognizer.Reset()  # start the next utterance from a clean decoder state
+                txt = res.get('text', '').strip()
+                had_preview = bool(last_partial)
+                last_partial = ''
+                partial_q.append('')  # an empty preview tells the GUI to remove the grey line
+                if txt:
+                    text_q.append(txt)
+                if (txt or had_preview) and gui_notify:
+                    gui_notify()
+            else:
+                # Preview the phrase being spoken, throttled so the GUI is not flooded.
+                now = time.monotonic()
+                if now - last_partial_time >= PARTIAL_INTERVAL:
+                    last_partial_time = now
+                    partial = json_loads(recognizer.PartialResult()).get('partial', '')
+                    if partial and partial != last_partial:
+                        last_partial = partial
+                        partial_q.append(partial)
+                        if gui_notify:
+                            gui_notify()
     except Exception as e:
         print('STT worker error:', e)
+    finally:
+        try:
+            close_audio_stream()
+        except Exception as e:
+            print('Audio stream close error:', e)
+        recognizer = None  # release the decoder once nothing can feed it
 
 # Start STT worker thread
 stt_thread = threading.Thread(target=stt_worker, daemon=True)
@@ -106,51 +401,101 @@ stt_thread.start()
 # ---------- Simple command handling ----------
 tasks = []
 
+_TIME_FMT = '%I:%M %p'
+_last_minute = None
+_last_time_str = ''
+
+
+def current_time_str() -> str:
+    """Return the local time as e.g. '03:07 PM', formatting at most once per minute."""
+    global _last_minute, _last_time_str
+    minute = int(time.time() // 60)
+    if minute != _last_minute:
+        _last_time_str = time.strftime(_TIME_FMT)
+        _last_minute = minute
+    return _last_time_str
+
+
+def _cmd_add_task(cmd, gui_append_fn):
+    speak('What is the task?')
+    gui_append_fn('Assistant: What is the task?\n')
+    # Next recognized phrase will be taken as task by the main loop
+    return ('awaiting_task', None)
+
+
+def _cmd_list_tasks(cmd, gui_append_fn):
+    if tasks:
+        for t in tasks:
+            gui_append_fn(f"Assistant: {t}\n")
+        speak('Your tasks are: ' + ', '.join(tasks))
+    else:
+        gui_append_fn('Assistant: You have no tasks.\n')
+        speak('You have no tasks.')
+    return ('done', None)
+
+
+def _cmd_screenshot(cmd, gui_append_fn):
+    # JPEG encodes several times faster than PNG on large displays. The capture and JPEG modules
+    # (pyscreeze, PIL ImageGrab) are imported ahead of time by warm_up_commands.
+    path = os.path.join(os.getcwd(), f'screenshot_{int(time.time())}.jpg')
+    img = pyautogui.screenshot()
+    img.convert('RGB').save(path, format='JPEG', quality=90)
+    gui_append_fn(f'Assistant: Screenshot saved to {path}\n')
+    speak('Screenshot taken for you.')
+    return ('done', None)
+
+
+def _cmd_open_browser(cmd, gui_append_fn):
+    gui_append_fn('Assistant: Opening browser.\n')
+    speak('Opening browser')
+    webbrowser.open('https://www.google.com')
+    return ('done', None)
+
+
+def _cmd_time(cmd, gui_append_fn):
+    now = current_time_str()
+    gui_append_fn(f'Assistant: The time is {now}\n')
+    speak(f'The time is {now}')
+    return ('done', None)
+
+
+def _cmd_exit(cmd, gui_append_fn):
+    gui_append_fn('Assistant: Goodbye!\n')
+    speak('Goodbye')
+    return ('exit', None)
+
+
+# keyword -> handler, in priority order: when a phrase contains several keywords the one listed
+# first wins, whatever its position (so "quit telling me the time" tells the time). CMD_RE finds
+# every keyword in a single scan of the text. Longer phrases come first in the alternation so
+# e.g. 'add task' wins over 'add'; a bare 'add' only counts as the first word.
+HANDLERS = {
+    'add task': _cmd_add_task,
+    'add tasks': _cmd_add_task,
+    'add': _cmd_add_task,
+    'list tasks': _cmd_list_tasks,
+    'show tasks': _cmd_list_tasks,
+    'screenshot': _cmd_screenshot,
+    'screenshots': _cmd_screenshot,
+    'open chrome': _cmd_open_browser,
+    'open browser': _cmd_open_browser,
+    'time': _cmd_time,
+    'exit': _cmd_exit,
+    'quit': _cmd_exit,
+    'goodbye': _cmd_exit,
+}
+CMD_RE = re.compile(r'\b(' + '|'.join(re.escape(k) for k in HANDLERS) + r')\b')
+_CMD_PRIORITY = {k: i for i, k in enumerate(HANDLERS)}
+
 
 def handle_command(cmd: str, gui_append_fn):
     """Process recognized command and produce responses."""
     cmd = cmd.lower()
     gui_append_fn(f"You: {cmd}\n")
 
-    if 'add task' in cmd or cmd.startswith('add'):
-        speak('What is the task?')
-        gui_append_fn('Assistant: What is the task?\n')
-        # Next recognized phrase will be taken as task by the main loop
-        return ('awaiting_task', None)
-
-    if 'list tasks' in cmd or 'show tasks' in cmd:
-        if tasks:
-            for t in tasks:
-                gui_append_fn(f"Assistant: {t}\n")
-                speak(t)
-        else:
-            gui_append_fn('Assistant: You have no tasks.\n')
-            speak('You have no tasks.')
-        return ('done', None)
-
-    if 'screenshot' in cmd or 'take a screenshot' in cmd:
-        path = os.path.join(os.getcwd(), f'screenshot_{int(time.time())}.png')
-        pyautogui.screenshot(path)
-        gui_append_fn(f'Assistant: Screenshot saved to {path}\n')
-        speak('Screenshot taken for you.')
-        return ('done', None)
-
-    if 'open chrome' in cmd or 'open browser' in cmd:
-        gui_append_fn('Assistant: Opening browser.\n')
-        speak('Opening browser')
-        webbrowser.open('https://www.google.com')
-        return ('done', None)
-
-    if 'time' in cmd or "what's the time" in cmd or 'current time' in cmd:
-        now = datetime.datetime.now().strftime('%I:%M %p')
-        gui_append_fn(f'Assistant: The time is {now}\n')
-        speak(f'The time is {now}')
-        return ('done', None)
-
-    if 'exit' in cmd or 'quit' in cmd or 'goodbye' in cmd:
-        gui_append_fn('Assistant: Goodbye!\n')
-        speak('Goodbye')
-        return ('exit', None)
+    keywords = [m.group(1) for m in CMD_RE.finditer(cmd) if m.group(1) != 'add' or m.start() == 0]
+    if keywords:
+        return HANDLERS[min(keywords, key=_CMD_PRIORITY.__getitem__)](cmd, gui_append_fn)
 
     # If we reach here, not understood
     gui_append_fn("Assistant: I didn't understand that. Try again.\n")
@@ -194,7 +539,11 @@ class CuteAssistantGUI(tk.Tk):
         self.transcript = scrolledtext.ScrolledText(self, wrap=tk.WORD, width=58, height=18, font=('Helvetica', 10))
         self.transcript.pack(padx=12, pady=(8,16))
         self.transcript.insert(tk.END, 'Assistant: Ready. Click Start Listening to begin.\n')
+        self.transcript.tag_configure('partial', foreground='#999999', font=('Helvetica', 10, 'italic'))
         self.transcript.configure(state='disabled')
+        self._pending_transcript = []
+        self._partial_text = ''  # greyed-out preview shown on the last line while speaking
+        self._flush_scheduled = False
 
         tips = tk.Label(
             self,
@@ -207,47 +556,90 @@ class CuteAssistantGUI(tk.Tk):
 
 
         self.awaiting_task = False
-        self.after(200, self.check_text_queue)
+        threading.Thread(target=load_model, daemon=True).start()
+        global gui_notify
+        self.bind('<<STT>>', self.on_stt)
+        gui_notify = self.notify_stt
 
         # Closing behavior
         self.protocol('WM_DELETE_WINDOW', self.on_close)
 
     def append_transcript(self, text: str):
+        """Queue text for the transcript; all appends made before Tk goes idle land in one update."""
+        self._pending_transcript.append(text)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.after_idle(self._flush_transcript)
+
+    def show_partial(self, text: str):
+        """Replace the greyed-out preview line; an empty string removes it."""
+        self._partial_text = text
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.after_idle(self._flush_transcript)
+
+    def _flush_transcript(self):
+        self._flush_scheduled = False
         self.transcript.configure(state='normal')
-        self.transcript.insert(tk.END, text)
+        # The preview always stays last, so drop it before appending and re-add it afterwards.
+        partial_range = self.transcript.tag_ranges('partial')
+        if partial_range:
+            self.transcript.delete(*partial_range)
+        self.transcript.insert(tk.END, ''.join(self._pending_transcript))
+        self._pending_transcript.clear()
+        if self._partial_text:
+            self.transcript.insert(tk.END, f'{self._partial_text}...\n', 'partial')
+        line_count = int(self.transcript.index('end-1c').split('.')[0])
+        if line_count > MAX_TRANSCRIPT_LINES:
+            self.transcript.delete('1.0', f'{line_count - MAX_TRANSCRIPT_LINES}.0')
         self.transcript.see(tk.END)
         self.transcript.configure(state='disabled')
 
     def toggle_listen(self):
+        if not model_ready.is_set():
+            self.append_transcript('Assistant: Loading model... please try again in a moment.\n')
+            return
         if not vosk_model:
-            messagebox.showerror('Model missing', 'VOSK model not found. Put model folder next to script.')
+            messagebox.showerror('Model not loaded', model_error)
             return
         if listening_flag.is_set():
             self.stop_listen()
         else:
+            global listen_generation
+            listen_generation += 1  # bump before set() so the first new audio block sees it
             listening_flag.set()
             self.listen_btn.config(text='Listening...', bg='#DFF7E0')
             self.append_transcript('Assistant: Listening...\n')
 
     def stop_listen(self):
         listening_flag.clear()
+        self.show_partial('')
         self.listen_btn.config(text='Start Listening', bg='#FFDFE4')
         self.append_transcript('Assistant: Stopped listening.\n')
 
     def save_tasks(self):
         try:
             with open('tasks.txt', 'w', encoding='utf-8') as f:
-                for t in tasks:
-                    f.write(t + '\n')
+                f.write(''.join(t + '\n' for t in tasks))
+                f.flush()
+                os.fsync(f.fileno())
             messagebox.showinfo('Saved', 'Tasks saved to tasks.txt')
         except Exception as e:
             messagebox.showerror('Error', str(e))
 
-    def check_text_queue(self):
-        """Poll text_q for new recognized text and handle it."""
+    def notify_stt(self):
+        """Wake the Tk main loop from the STT thread; event_generate is safe to call from any thread."""
         try:
-            while not text_q.empty():
-                txt = text_q.get_nowait()
+            self.event_generate('<<STT>>', when='tail')
+        except (tk.TclError, RuntimeError):
+            pass  # window already destroyed
+
+    def on_stt(self, event=None):
+        """Drain text_q and handle each recognized phrase, then refresh the partial preview."""
+        try:
+            while text_q:
+                txt = text_q.popleft()
+                self.show_partial('')
                 if self.awaiting_task:
                     tasks.append(txt)
                     self.append_transcript(f'Assistant: Added task: {txt}\n')
@@ -259,14 +651,28 @@ class CuteAssistantGUI(tk.Tk):
                         self.awaiting_task = True
                     elif result_state == 'exit':
                         self.on_close()
+                        if shutdown_evt.is_set():
+                            return
         except Exception as e:
             print('Queue check error:', e)
-        finally:
-            self.after(200, self.check_text_queue)
+        if not listening_flag.is_set():
+            partial_q.clear()  # a preview posted just before Stop must not reappear
+            return
+        try:
+            self.show_partial(partial_q.popleft())
+        except IndexError:
+            pass  # no new preview
 
     def on_close(self):
         if messagebox.askokcancel('Quit', 'Do you want to quit?'):
+            shutdown_evt.set()
             listening_flag.clear()
+            audio_evt.set()  # wake stt_worker so it sees shutdown_evt
+            try:
+                close_audio_stream()  # release the microphone right away
+            except Exception as e:
+                print('Audio stream close error:', e)
+            stop_tts()  # the TTS thread owns `engine`, so it stops the engine itself
             self.destroy()
 
 